@@ -1,3 +1,11 @@
-from crepesr_proxy.proxy import Proxy
-
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # Importing mitmproxy is slow, only do it when Proxy is actually used so
+    # lightweight entrypoints like `crepesr_proxy.ctl` start instantly.
+    if name == "Proxy":
+        from crepesr_proxy.proxy import Proxy
+
+        return Proxy
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -5,6 +5,7 @@ from crepesr_proxy.proxy.exceptions import (
     UnsetSystemProxyError,
 )
 import time
+import signal
 import sys
 import logging
 
@@ -17,8 +18,13 @@ handler.setFormatter(formatter)
 logger.addHandler(handler)
 
 
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
 def main():
     sys_proxy_set = True
+    daemon_mode = False
     proxy_manager = Proxy()
     # I'm too lazy to use argparse
     for arg in sys.argv:
@@ -46,6 +52,8 @@ def main():
             proxy_manager.set_server_port(arg.split("=")[1])
         elif arg.startswith("--no-set-system-proxy"):
             sys_proxy_set = False
+        elif arg.startswith("--daemon"):
+            daemon_mode = True
         elif arg.startswith("--ys") or arg.startswith("--genshin"):
             proxy_manager.proxy_type = ProxyType.YS
         elif arg.startswith("--help"):
@@ -60,10 +68,26 @@ Options:
     --no-set-system-proxy     Do not set the system proxy.
     --ys                      Set the proxy mode to Genshin.
     --genshin                 Alias to --ys.
+    --daemon                  Stay resident and accept commands from
+                              `python -m crepesr_proxy.ctl`.
     --help                    Show this message and exit."""
             )
             return
 
+    daemon = None
+    if daemon_mode:
+        # Imported here so the daemon module is only loaded when needed.
+        from crepesr_proxy.daemon import Daemon
+
+        # Claim the control socket before touching the proxy or iptables,
+        # so a second daemon exits without side effects.
+        try:
+            daemon = Daemon(proxy_manager)
+            daemon.bind()
+        except (RuntimeError, NotImplementedError, OSError) as e:
+            logger.error(e)
+            return
+
     logger.info("Creating new mitmproxy instance...")
     logging.getLogger("mitmproxy").setLevel(logging.ERROR)
     logger.info("Starting proxy...")
@@ -93,20 +117,40 @@ Options:
         )
     )
     logger.info("Press Ctrl+C to stop proxy.")
+    if daemon is not None:
+        # Clean up when stopped with `kill` or when the terminal closes too.
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        signal.signal(signal.SIGHUP, _raise_interrupt)
     try:
-        while True:
-            time.sleep(1e6)
+        if daemon is not None:
+            daemon.redirecting = sys_proxy_set
+            try:
+                daemon.serve_forever()
+            except OSError as e:
+                logger.error(e)
+            finally:
+                sys_proxy_set = daemon.redirecting
+        else:
+            while True:
+                time.sleep(1e6)
     except KeyboardInterrupt:
         pass
-    if sys_proxy_set:
-        try:
-            logger.info("Unsetting system proxy...")
-            proxy_manager.unset_system_proxy()
-        except UnsetSystemProxyError as e:
-            logger.error(e)
-    logger.info("Stopping proxy...")
-    proxy_manager.stop_proxy()
-    logger.info("Proxy stopped.")
+    finally:
+        # Always clean up, a leftover iptables rule breaks the user's traffic.
+        if daemon is not None:
+            # Don't let a second signal interrupt the cleanup below.
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            daemon.close()
+        if sys_proxy_set:
+            try:
+                logger.info("Unsetting system proxy...")
+                proxy_manager.unset_system_proxy()
+            except UnsetSystemProxyError as e:
+                logger.error(e)
+        logger.info("Stopping proxy...")
+        proxy_manager.stop_proxy()
+        logger.info("Proxy stopped.")
 
 
 main()
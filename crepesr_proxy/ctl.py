@@ -0,0 +1,82 @@
+import json
+import socket
+import sys
+from crepesr_proxy import utils
+
+# Seconds to wait for the daemon to answer.
+TIMEOUT = 10
+
+
+def send_command(command: str, **kwargs) -> dict:
+    """
+    Sends a command to the running daemon.
+
+    Args:
+        command: Name of the command, see `crepesr_proxy.ctl --help`.
+        kwargs: Arguments of the command.
+
+    Returns:
+        The daemon response as a dict.
+    """
+    request = dict(command=command, **kwargs)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(TIMEOUT)
+        s.connect(str(utils.get_control_socket_path()))
+        with s.makefile("rwb") as file:
+            file.write(json.dumps(request).encode() + b"\n")
+            file.flush()
+            return json.loads(file.readline())
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] == "--help":
+        print(
+            """Usage: crepesr-proxy-ctl COMMAND [ARGS]
+Commands:
+    status                    Show the daemon status.
+    start                     Start redirecting (set the system proxy).
+    stop                      Stop redirecting (unset the system proxy).
+    server ADDRESS[:PORT]     Set the server address to redirect to.
+    type sr|ys                Set the proxy mode.
+    shutdown                  Stop the daemon.
+    --help                    Show this message and exit."""
+        )
+        return
+    command, kwargs = args[0], {}
+    try:
+        match command:
+            case "server":
+                address = args[1].split(":")
+                kwargs["address"] = address[0]
+                if len(address) > 1:
+                    kwargs["port"] = address[1]
+            case "type":
+                kwargs["type"] = args[1]
+    except IndexError:
+        print("Missing argument for {}, see --help.".format(command))
+        sys.exit(1)
+    try:
+        response = send_command(command, **kwargs)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("Daemon is not running, start it with `crepesr_proxy --daemon`.")
+        sys.exit(1)
+    except TimeoutError:
+        print("Daemon didn't answer in {} seconds.".format(TIMEOUT))
+        sys.exit(1)
+    except OSError as e:
+        print("Failed to talk to the daemon: {}".format(e))
+        sys.exit(1)
+    except ValueError:
+        print("Daemon closed the connection without a valid reply.")
+        sys.exit(1)
+    if not response["ok"]:
+        print("Error: {}".format(response["error"]))
+        sys.exit(1)
+    for key, value in response.items():
+        if key != "ok":
+            print("{}: {}".format(key, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import socket
+import stat
+from crepesr_proxy import utils
+from crepesr_proxy.proxy import Proxy, ProxyType
+from crepesr_proxy.proxy.exceptions import ProxyException
+
+
+class Daemon:
+    # Seconds a control client has to send its request.
+    CLIENT_TIMEOUT = 5
+
+    def __init__(self, proxy: Proxy, redirecting: bool = False):
+        """
+        Keeps a running proxy resident and lets `crepesr_proxy.ctl` reconfigure
+        it through a Unix socket, so switching servers doesn't need a cold start.
+
+        Args:
+            proxy: An already started proxy.
+            redirecting: Whether the system proxy is currently set.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise NotImplementedError("Daemon mode requires Unix sockets.")
+        self._logger = logging.getLogger("crepesr-proxy.daemon")
+        self._proxy = proxy
+        self._socket = None
+        self._running = False
+        self.redirecting = redirecting
+        self.socket_path = utils.get_control_socket_path()
+
+    def bind(self):
+        """
+        Claims the control socket.
+
+        Raises:
+            RuntimeError: Another daemon is running or the path isn't a socket.
+        """
+        try:
+            mode = self.socket_path.lstat().st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise RuntimeError(
+                    "{} exists and is not a socket, refusing to use it".format(
+                        self.socket_path
+                    )
+                )
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                    s.connect(str(self.socket_path))
+            except ConnectionRefusedError:
+                # Left over from a daemon that didn't exit cleanly.
+                self.socket_path.unlink()
+            else:
+                raise RuntimeError(
+                    "Another daemon is already listening on {}".format(
+                        self.socket_path
+                    )
+                )
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        sock.listen()
+        self._socket = sock
+
+    def close(self):
+        """
+        Closes the control socket and removes its file.
+        """
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        self.socket_path.unlink(missing_ok=True)
+
+    def serve_forever(self):
+        """
+        Serves control requests until a `shutdown` command is received.
+        """
+        if self._socket is None:
+            self.bind()
+        self._running = True
+        self._logger.info("Control socket: {}".format(self.socket_path))
+        try:
+            while self._running:
+                conn, _ = self._socket.accept()
+                with conn:
+                    try:
+                        self._handle(conn)
+                    except OSError as e:
+                        # One misbehaving client must not take the daemon down.
+                        self._logger.warning("Control client error: {!r}".format(e))
+        finally:
+            self.close()
+
+    def _handle(self, conn: socket.socket):
+        # Don't let a client that never sends a full line block everyone else.
+        conn.settimeout(self.CLIENT_TIMEOUT)
+        with conn.makefile("rwb") as file:
+            try:
+                line = file.readline()
+            except TimeoutError:
+                self._logger.warning("Control client timed out")
+                return
+            if not line.strip():
+                # Connection probes (e.g. from `bind`) send nothing.
+                return
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+                response = self._dispatch(request)
+            except (ValueError, TypeError, KeyError) as e:
+                response = {"ok": False, "error": "Invalid request: {}".format(e)}
+            except (ProxyException, RuntimeError) as e:
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:
+                self._logger.exception("Failed to handle control request")
+                response = {"ok": False, "error": "Internal error: {!r}".format(e)}
+            file.write(json.dumps(response).encode() + b"\n")
+            file.flush()
+
+    def _dispatch(self, request: dict) -> dict:
+        command = request["command"]
+        self._logger.debug("Received command: {}".format(command))
+        match command:
+            case "status":
+                pass
+            case "start":
+                if not self.redirecting:
+                    self._proxy.set_system_proxy()
+                    self.redirecting = True
+            case "stop":
+                if self.redirecting:
+                    self._proxy.unset_system_proxy()
+                    self.redirecting = False
+            case "type":
+                proxy_type = request["type"]
+                if not isinstance(proxy_type, str):
+                    raise TypeError("type must be a string")
+                self._proxy.proxy_type = ProxyType[proxy_type.upper()]
+            case "server":
+                address = request["address"]
+                if not isinstance(address, str):
+                    raise TypeError("address must be a string")
+                port = request.get("port") or 0
+                if not isinstance(port, (str, int)):
+                    raise TypeError("port must be a string or an integer")
+                self._proxy.set_server_address(address, int(port))
+            case "shutdown":
+                self._running = False
+            case _:
+                return {"ok": False, "error": "Unknown command: {}".format(command)}
+        return self._status()
+
+    def _status(self) -> dict:
+        server_address, server_port = self._proxy.get_server_address()
+        return {
+            "ok": True,
+            "proxy_type": self._proxy.proxy_type.name,
+            "proxy": "{}:{}".format(self._proxy.proxy_host, self._proxy.proxy_port),
+            "server_address": server_address,
+            "server_port": server_port,
+            "redirecting": self.redirecting,
+        }
@@ -102,6 +102,7 @@ class Proxy:
         Manage mitmproxy to create necessary proxy for the app to work.
         """
         self._mitm = None
+        self._sniffer = None
         self._loop, self._thread = self._create_loop()
         self._proxy_type = proxy_type
         self.proxy_port = 13168
@@ -140,13 +141,14 @@ class Proxy:
 
     @proxy_type.setter
     def proxy_type(self, value: ProxyType):
-        if self._mitm is not None:
-            raise RuntimeError(
-                "Cannot change proxy type after mitmproxy is created. "
-                + "You need to stop the proxy first."
-            )
         self._proxy_type = value
         self._set_logger()
+        if self._mitm is not None:
+            # Swap the sniffer in place so the listener and its TLS state survive.
+            future = asyncio.run_coroutine_threadsafe(
+                self._swap_sniffer(), self._loop
+            )
+            future.result()
 
     def _create_mitmproxy_options(self):
         """
@@ -166,12 +168,23 @@ class Proxy:
             self._logger.warning("mitmproxy is already created")
             return
         self._mitm = DumpMaster(options=self._mitm_options)
+        self._sniffer = self._create_sniffer()
+        self._mitm.addons.add(self._sniffer)
+        self._logger.debug("mitmproxy instance created")
+
+    def _create_sniffer(self):
         match self._proxy_type:
             case ProxyType.SR:
-                self._mitm.addons.add(SRSniffer())
+                return SRSniffer()
             case ProxyType.YS:
-                self._mitm.addons.add(YSSniffer())
-        self._logger.debug("mitmproxy instance created")
+                return YSSniffer()
+
+    async def _swap_sniffer(self):
+        # Addons must be changed from the loop mitmproxy is running on.
+        self._mitm.addons.remove(self._sniffer)
+        self._sniffer = self._create_sniffer()
+        self._mitm.addons.add(self._sniffer)
+        self._logger.debug("Sniffer switched to {}".format(self._proxy_type.name))
 
     async def _run_mitmdump(self, port):
         if not self._mitm:
@@ -219,6 +232,7 @@ class Proxy:
         self._loop.stop()
         self._loop, self._thread = self._create_loop()
         del self._mitm
+        self._sniffer = None
 
     def _get_system_cert_path(self):
         match platform.system():
@@ -335,12 +349,10 @@ class Proxy:
     def set_server_address(self, address, port: int = 0):
         """
         Sets the server address for the proxy to redirect to.
+
+        Sniffers read the address on every request, so this also applies
+        to a running proxy.
         """
-        if self._mitm is not None:
-            raise RuntimeError(
-                "Cannot change proxy address after mitmproxy is created."
-                + " You need to stop the proxy first."
-            )
         if self._proxy_type == ProxyType.SR:
             SRSniffer.HOST = address
             if port != 0:
@@ -354,11 +366,6 @@ class Proxy:
         """
         Sets the server port for the proxy to redirect to.
         """
-        if self._mitm is not None:
-            raise RuntimeError(
-                "Cannot change proxy address after mitmproxy is created."
-                + " You need to stop the proxy first."
-            )
         if self._proxy_type == ProxyType.SR:
             SRSniffer.PORT = port
         elif self._proxy_type == ProxyType.YS:
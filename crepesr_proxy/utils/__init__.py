@@ -1,6 +1,9 @@
+import os
 import platform
 import socket
 from contextlib import closing
+from pathlib import Path
+from tempfile import gettempdir
 
 match platform.system():
     case "Windows":
@@ -22,3 +25,20 @@ def get_free_port() -> int:
         s.bind(("", 0))
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     return s.getsockname()[1]
+
+
+def get_control_socket_path() -> Path:
+    """
+    Gets the path of the Unix socket used to control the daemon.
+
+    It can be overridden with the `CONTROL_SOCKET` environment variable.
+
+    Returns:
+        A Path to the control socket.
+    """
+    if os.getenv("CONTROL_SOCKET"):
+        return Path(os.getenv("CONTROL_SOCKET"))
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir, "crepesr-proxy.sock")
+    return Path(gettempdir(), "crepesr-proxy-{}.sock".format(os.getuid()))